@@ -0,0 +1,2 @@
+from .core import (APIError, RetryableError, get_history, scrape_history_csv,
+        write_history_csv)
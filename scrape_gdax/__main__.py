@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import datetime
+import logging
+
+from .core import GRANULARITY, MAX_RESULTS, logger, scrape_history_csv
+
+
+if __name__ == '__main__':
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.INFO)
+
+    DESCRIPTION = 'Scrape GDAX data and output to a CSV.'
+    parser = argparse.ArgumentParser(prog='scrape_gdax',
+            description=DESCRIPTION)
+
+    PRODUCT_ARG = 'product'
+    PRODUCT_HELP = 'GDAX product to scrape data for. E.g. BTC-USD.'
+    parser.add_argument(PRODUCT_ARG, help=PRODUCT_HELP)
+
+    PAGES_ARG = 'pages'
+    PAGES_HELP = ('The number of pages of data to scrape.'
+            f' Each page has a maximum of {MAX_RESULTS:d} results.')
+    parser.add_argument(PAGES_ARG, type=int, help=PAGES_HELP)
+
+    GRANULARITY_ARG = 'g'
+    GRANULARITY_META = 'granularity'
+    GRANULARITY_DEFAULT = GRANULARITY
+    GRANULARITY_HELP = ('Granularity of data in seconds.'
+            f' Default is {GRANULARITY_DEFAULT:d}.')
+    parser.add_argument(f'-{GRANULARITY_ARG}',
+            metavar=GRANULARITY_META, type=int, default=GRANULARITY_DEFAULT,
+            help=GRANULARITY_HELP)
+
+    STARTDATE_ARG = 's'
+    STARTDATE_META = 'start-date'
+    STARTDATE_HELP = ('Date and time to start scraping backwards from.'
+            ' Uses the ISO 8601 format (E.g. 2017-07-14T10:19:32).'
+            ' Default is the current date and time.')
+    parser.add_argument(f'-{STARTDATE_ARG}', metavar=STARTDATE_META,
+            help=STARTDATE_HELP)
+
+    OUTPUT_ARG = 'o'
+    OUTPUT_META = 'output-file'
+    OUTPUT_DEFAULT = 'gdax_history_{product}_{granularity}.csv'
+    OUTPUT_HELP = f'CSV file output. Default is {OUTPUT_DEFAULT}.'
+    parser.add_argument(f'-{OUTPUT_ARG}', metavar=OUTPUT_META,
+            default=OUTPUT_DEFAULT, help=OUTPUT_HELP)
+
+    args = parser.parse_args()
+
+    product = getattr(args, PRODUCT_ARG)
+    pages = getattr(args, PAGES_ARG)
+    granularity = getattr(args, GRANULARITY_ARG)
+    start_date = getattr(args, STARTDATE_ARG)
+    filename = getattr(args, OUTPUT_ARG)
+    filename = filename.format(product=product, granularity=granularity)
+
+    # Convert ISO 8601 datetime to datetime object
+    try:
+        start_utc = datetime.datetime.strptime(start_date, '%Y-%m-%dT%H:%M:%S')
+    except ValueError:
+        print(f'Invalid datetime format: {start_date}')
+        exit()
+    except TypeError:
+        # Use current time if no datetime was supplied
+        start_utc = datetime.datetime.now(datetime.timezone.utc)
+
+    # Set timezone if no timezone was supplied
+    if start_utc.tzinfo is None or start_utc.utcoffset() is None:
+        start_utc = start_utc.replace(tzinfo=datetime.timezone.utc)
+
+    # Round start date based on chosen granularity
+    start_timestamp = start_utc.timestamp()
+    time_delta = start_timestamp % granularity
+    start_timestamp -= time_delta
+    rounded_start_utc = datetime.datetime.fromtimestamp(start_timestamp,
+            tz=datetime.timezone.utc)
+
+    # Get history and write to CSV
+    asyncio.run(scrape_history_csv(filename, rounded_start_utc, product,
+            granularity, pages))
@@ -0,0 +1,326 @@
+import asyncio
+import collections
+import datetime
+import itertools
+import logging
+import time
+
+import aiohttp
+import diskcache
+import numpy as np
+import orjson
+from tenacity import (retry, retry_if_exception_type, stop_after_attempt,
+        wait_exponential)
+
+logger = logging.getLogger('scrape_gdax')
+
+# GDAX historic rates endpoint
+CANDLES_URL = 'https://api.pro.coinbase.com/products/{product}/candles'
+
+# 60 second price intervals
+GRANULARITY = 60
+
+# Fields per candle: time, low, high, open, close, volume
+CANDLE_FIELDS = 6
+
+# Maximum results per page
+MAX_RESULTS = 200
+
+# Number of pages to retrieve
+PAGES = 100
+
+# GDAX rate limit of 3 requests per second
+RATE_LIMIT = 1.0 / 3.0
+
+# Maximum number of requests in flight at once
+CONCURRENT_REQUESTS = 3
+
+# Total time allowed for a single page request in seconds
+REQUEST_TIMEOUT = 30
+
+# Time to keep resolved GDAX addresses in seconds
+DNS_CACHE_TTL = 300
+
+# Directory of the on-disk page cache
+CACHE_DIRECTORY = '.gdax_cache'
+
+# CSV output buffer size in bytes
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Maximum number of fetched pages waiting to be written
+WRITE_QUEUE_SIZE = 4
+
+# Maximum number of pages being fetched or waiting to be consumed, so a slow
+# consumer holds back fetching instead of letting pages pile up in memory
+MAX_PENDING_PAGES = CONCURRENT_REQUESTS + WRITE_QUEUE_SIZE
+
+# Maximum number of attempts per page before giving up
+MAX_RETRIES = 5
+
+
+class RetryableError(Exception):
+    """
+    Transient GDAX API error, e.g. rate limiting or a server error
+    """
+
+
+class APIError(Exception):
+    """
+    Permanent GDAX API error that retrying will not fix
+    """
+
+
+async def get_history(date, product, granularity=GRANULARITY, pages=PAGES):
+    """
+    Get GDAX price history
+
+    Pages are requested concurrently, bounded by CONCURRENT_REQUESTS and
+    paced so that the GDAX rate limit is respected. Fetched pages are
+    cached on disk, so only pages missing from the cache hit the API.
+    Pages are yielded in order as soon as they are available, so the
+    caller can process them while later pages are still being fetched.
+    At most MAX_PENDING_PAGES pages are fetched ahead of the caller.
+
+    :param date: datetime object to start from
+    :param product: the GDAX product to get the history of
+    :param granularity: granularity of history in seconds
+    :param pages: number of pages to retrieve, results per page vary
+    :returns: GDAX price history, one page at a time, newest first
+    :rtype: AsyncIterator[List]
+    """
+
+    if pages < 1:
+        return
+
+    url = CANDLES_URL.format(product=product)
+    delta = datetime.timedelta(seconds=granularity * MAX_RESULTS)
+
+    # Page windows are deterministic, so compute (start, end) pairs up front
+    windows = [(date - delta * (i + 1), date - delta * i)
+            for i in range(pages)]
+
+    semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
+    pace_lock = asyncio.Lock()
+    next_request = time.monotonic()
+
+    # Bind per-page lookups once for the whole run
+    info = logger.info
+    warning = logger.warning
+    now = time.time()
+
+    async def wait_for_rate_limit():
+        nonlocal next_request
+
+        # Space request starts RATE_LIMIT apart without sleeping after the
+        # last one, so time spent parsing a page counts towards the gap
+        async with pace_lock:
+            delay = next_request - time.monotonic()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            next_request = time.monotonic() + RATE_LIMIT
+
+    # Back off exponentially on connection errors, timeouts and throttling
+    @retry(stop=stop_after_attempt(MAX_RETRIES),
+            wait=wait_exponential(multiplier=0.3, max=10),
+            retry=retry_if_exception_type((aiohttp.ClientError,
+                asyncio.TimeoutError, RetryableError)),
+            reraise=True)
+    async def fetch(session, i, window):
+        start, end = window
+        params = {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'granularity': granularity,
+        }
+
+        key = (product, granularity, params['start'], params['end'])
+
+        # Historical candles never change, so a cached page can be reused
+        # without a request or a rate limit delay
+        new_history = cache.get(key)
+
+        if new_history is not None:
+            info('%s to %s (cached)', end, start)
+            return new_history
+
+        async with semaphore:
+            info('%s to %s', end, start)
+            info('(%d/%d)', i + 1, pages)
+
+            await wait_for_rate_limit()
+
+            try:
+                async with session.get(url, params=params) as resp:
+                    if resp.status == 429 or resp.status >= 500:
+                        raise RetryableError(
+                                f'{resp.status:d}: {await resp.text()}')
+
+                    if resp.status >= 400:
+                        raise APIError(
+                                f'{resp.status:d}: {await resp.text()}')
+
+                    raw = await resp.read()
+
+                try:
+                    new_history = orjson.loads(raw)
+                except orjson.JSONDecodeError as error:
+                    raise RetryableError(error) from error
+
+            except (aiohttp.ClientError, asyncio.TimeoutError,
+                    RetryableError) as error:
+                warning(error)
+                raise
+
+        # If results are not a list, most likely an API error occurred
+        if not isinstance(new_history, list):
+            warning('Unexpected response: %s', new_history)
+            raise RetryableError(new_history)
+
+        # Drop malformed rows once at ingest so the CSV writer never has to
+        # check them
+        valid = []
+
+        for bar in new_history:
+            if (isinstance(bar, list) and len(bar) == CANDLE_FIELDS
+                    and all(isinstance(value, (int, float)) for value in bar)):
+                valid.append(bar)
+            else:
+                warning('Skipping row: %s', bar)
+
+        new_history = valid
+
+        info('Number of new results: %d', len(new_history))
+
+        # The newest page may still be missing candles, so only keep it
+        # until the next candle is due
+        if end.timestamp() + granularity > now:
+            cache.set(key, new_history, expire=granularity)
+        else:
+            cache.set(key, new_history)
+
+        return new_history
+
+    # Share one pool of keep-alive connections between all pages, so the
+    # TLS handshake and DNS lookup are paid once per connection, not per page
+    connector = aiohttp.TCPConnector(limit=CONCURRENT_REQUESTS,
+            ttl_dns_cache=DNS_CACHE_TTL)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    with diskcache.Cache(CACHE_DIRECTORY) as cache:
+        async with aiohttp.ClientSession(connector=connector,
+                timeout=timeout) as session:
+            unscheduled = enumerate(windows)
+            tasks = collections.deque()
+
+            try:
+                while True:
+                    # Top up the outstanding fetches as pages are consumed
+                    for i, window in itertools.islice(unscheduled,
+                            MAX_PENDING_PAGES - len(tasks)):
+                        tasks.append(asyncio.ensure_future(
+                                fetch(session, i, window)))
+
+                    if not tasks:
+                        break
+
+                    # Drop each task once its page is consumed so finished
+                    # pages are not kept alive until the last one is yielded
+                    yield await tasks.popleft()
+
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+
+def write_history_csv(csvfile, history):
+    """
+    Write GDAX price history to a CSV file
+
+    get_history only yields candles with CANDLE_FIELDS numeric fields, none
+    of which need quoting, so rows are formatted directly instead of
+    through csv.writer.
+
+    :param csvfile: binary file object to write rows to
+    :param history: GDAX price history, as returned by get_history
+    """
+
+    # Convert timestamps to UTC ISO dates for use with backtrader in one
+    # vectorized pass
+    timestamps = np.fromiter((bar[0] for bar in history), dtype=np.int64,
+            count=len(history))
+    dates = np.datetime_as_string(timestamps.astype('datetime64[s]'),
+            unit='s')
+
+    # np.char.replace cannot size its output for an empty array
+    if dates.size:
+        dates = np.char.replace(dates, 'T', ' ')
+
+    # Keep csv.writer's default \r\n line terminator
+    rows = [f'{date},{low},{high},{open_},{close},{volume}\r\n'
+            for date, (_, low, high, open_, close, volume)
+            in zip(dates.tolist(), history)]
+
+    # Encode and write the whole page at once
+    csvfile.write(''.join(rows).encode('ascii'))
+
+
+async def scrape_history_csv(filename, date, product,
+        granularity=GRANULARITY, pages=PAGES):
+    """
+    Scrape GDAX price history into a CSV file
+
+    Each page is written as soon as it is fetched instead of after the
+    whole history has been collected. Writes run in a worker thread fed by
+    a bounded queue, so disk I/O overlaps with fetching later pages.
+
+    :param filename: CSV file to write to
+    :param date: datetime object to start from
+    :param product: the GDAX product to get the history of
+    :param granularity: granularity of history in seconds
+    :param pages: number of pages to retrieve, results per page vary
+    """
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+    writing = None
+
+    async def read_pages():
+        async for history in get_history(date, product, granularity, pages):
+            await queue.put(history)
+
+        # Signal the end of the history
+        await queue.put(None)
+
+    async def write_pages(csvfile):
+        nonlocal writing
+
+        while True:
+            history = await queue.get()
+
+            if history is None:
+                break
+
+            writing = loop.run_in_executor(None, write_history_csv, csvfile,
+                    history)
+
+            # Cancelling the consumer must not abandon a write that is
+            # still running in the worker thread
+            await asyncio.shield(writing)
+
+    with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as csvfile:
+        producer = asyncio.ensure_future(read_pages())
+        consumer = asyncio.ensure_future(write_pages(csvfile))
+
+        try:
+            await asyncio.gather(producer, consumer)
+
+        finally:
+            producer.cancel()
+            consumer.cancel()
+
+            # Let an in-flight write finish before the file is closed
+            if writing is not None:
+                await asyncio.wait([writing])
+